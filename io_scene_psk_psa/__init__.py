@@ -129,3 +129,16 @@ def load_handler(dummy):
 
 
 bpy.app.handlers.load_post.append(load_handler)
+
+
+@persistent
+def clear_export_caches_handler(dummy):
+    # Loading a file, undo & redo all replace the export sequence lists without firing their update callbacks, so drop
+    # anything that was cached from them.
+    psa_export_properties.clear_filter_sequences_cache()
+    psa_export_properties.clear_duplicate_action_name_cache()
+
+
+bpy.app.handlers.load_post.append(clear_export_caches_handler)
+bpy.app.handlers.undo_post.append(clear_export_caches_handler)
+bpy.app.handlers.redo_post.append(clear_export_caches_handler)
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Optional, Set
 
+import numpy as np
 from bpy.types import Armature, Bone, Action, PoseBone
 
 from .data import *
@@ -31,12 +32,41 @@ class PsaBuildOptions:
         self.sequence_name_prefix: str = ''
         self.sequence_name_suffix: str = ''
         self.root_motion: bool = False
+        self.should_prune_unused_ancestors: bool = False
 
 
-def _get_pose_bone_location_and_rotation(pose_bone: PoseBone, armature_object: Object, options: PsaBuildOptions):
-    if pose_bone.parent is not None:
+def _get_animated_bone_names(options: PsaBuildOptions) -> Set[str]:
+    """
+    Returns the names of the bones that are animated by any of the actions contributing to the export sequences.
+    """
+    actions = set()
+    for export_sequence in options.sequences:
+        if export_sequence.nla_state.action is not None:
+            actions.add(export_sequence.nla_state.action)
+        else:
+            # The sequence is evaluated from the NLA strips in its frame range.
+            frame_min = min(export_sequence.nla_state.frame_start, export_sequence.nla_state.frame_end)
+            frame_max = max(export_sequence.nla_state.frame_start, export_sequence.nla_state.frame_end)
+            for nla_strip in get_nla_strips_in_frame_range(options.animation_data, frame_min, frame_max):
+                if nla_strip.action is not None:
+                    actions.add(nla_strip.action)
+    bone_names = set()
+    for action in actions:
+        for fcurve in action.fcurves:
+            bone_name = get_pose_bone_name_from_data_path(fcurve.data_path)
+            if bone_name is not None:
+                bone_names.add(bone_name)
+    return bone_names
+
+
+def _get_pose_bone_location_and_rotation(pose_bone: PoseBone, parent_pose_bone: Optional[PoseBone], armature_object: Object, options: PsaBuildOptions):
+    """
+    @param parent_pose_bone: The exported parent of the pose bone, or None if the pose bone is exported as a root bone.
+    This is not necessarily the same as the pose bone's parent, since the parent may have been pruned from the export.
+    """
+    if parent_pose_bone is not None:
         pose_bone_matrix = pose_bone.matrix
-        pose_bone_parent_matrix = pose_bone.parent.matrix
+        pose_bone_parent_matrix = parent_pose_bone.matrix
         pose_bone_matrix = pose_bone_parent_matrix.inverted() @ pose_bone_matrix
     else:
         if options.root_motion:
@@ -49,7 +79,7 @@ def _get_pose_bone_location_and_rotation(pose_bone: PoseBone, armature_object: O
     location = pose_bone_matrix.to_translation()
     rotation = pose_bone_matrix.to_quaternion().normalized()
 
-    if pose_bone.parent is not None:
+    if parent_pose_bone is not None:
         rotation.conjugate()
 
     return location, rotation
@@ -73,7 +103,11 @@ def build_psa(context: bpy.types.Context, options: PsaBuildOptions) -> Psa:
     pose_bones = [x[1] for x in pose_bones]
 
     # Get a list of all the bone indices and instigator bones for the bone filter settings.
-    export_bone_names = get_export_bone_names(armature_object, options.bone_filter_mode, options.bone_collection_indices)
+    animated_bone_names = None
+    if options.bone_filter_mode == 'BONE_COLLECTIONS' and options.should_prune_unused_ancestors:
+        animated_bone_names = _get_animated_bone_names(options)
+    export_bone_names = get_export_bone_names(armature_object, options.bone_filter_mode, options.bone_collection_indices,
+                                              animated_bone_names)
     bone_indices = [bone_names.index(x) for x in export_bone_names]
 
     # Make the bone lists contain only the bones that are going to be exported.
@@ -104,16 +138,18 @@ def build_psa(context: bpy.types.Context, options: PsaBuildOptions) -> Psa:
         except ValueError:
             psa_bone.parent_index = 0
 
-        if bone.parent is not None:
+        # Bones whose parent is not being exported are exported as root bones.
+        if bone.parent is not None and bone.parent in bones:
             rotation = bone.matrix.to_quaternion().conjugated()
             inverse_parent_rotation = bone.parent.matrix.to_quaternion().inverted()
             parent_head = inverse_parent_rotation @ bone.parent.head
             parent_tail = inverse_parent_rotation @ bone.parent.tail
             location = (parent_tail - parent_head) + bone.head
         else:
+            # Use the armature-space head and rotation, since the bone may have a parent that is not being exported.
             armature_local_matrix = armature_object.matrix_local
-            location = armature_local_matrix @ bone.head
-            bone_rotation = bone.matrix.to_quaternion().conjugated()
+            location = armature_local_matrix @ bone.head_local
+            bone_rotation = bone.matrix_local.to_quaternion().conjugated()
             local_rotation = armature_local_matrix.to_3x3().to_quaternion().conjugated()
             rotation = bone_rotation @ local_rotation
             rotation.conjugate()
@@ -141,6 +177,12 @@ def build_psa(context: bpy.types.Context, options: PsaBuildOptions) -> Psa:
     # Now build the PSA sequences.
     # We actually alter the timeline frame and simply record the resultant pose bone matrices.
     frame_start_index = 0
+    keys: List[np.ndarray] = []
+
+    # The exported parent of each pose bone, or None for pose bones that are exported as root bones.
+    exported_pose_bone_names = set(x.name for x in pose_bones)
+    parent_pose_bones = [x.parent if x.parent is not None and x.parent.name in exported_pose_bone_names else None
+                         for x in pose_bones]
 
     context.window_manager.progress_begin(0, len(options.sequences))
 
@@ -180,33 +222,38 @@ def build_psa(context: bpy.types.Context, options: PsaBuildOptions) -> Psa:
         psa_sequence.track_time = frame_count
         psa_sequence.key_reduction = 1.0
 
+        # The keys for the sequence are packed directly into a preallocated structured array instead of allocating a
+        # Psa.Key for each one.
+        sequence_keys = np.zeros(frame_count * len(pose_bones), dtype=Psa.KEY_DTYPE)
+        key_time = 1.0 / psa_sequence.fps
+        key_offset = 0
+
         frame = float(frame_start)
 
         for _ in range(frame_count):
             context.scene.frame_set(frame=int(frame), subframe=frame % 1.0)
 
-            for pose_bone in pose_bones:
-                location, rotation = _get_pose_bone_location_and_rotation(pose_bone, armature_object, options)
-
-                key = Psa.Key()
-                key.location.x = location.x
-                key.location.y = location.y
-                key.location.z = location.z
-                key.rotation.x = rotation.x
-                key.rotation.y = rotation.y
-                key.rotation.z = rotation.z
-                key.rotation.w = rotation.w
-                key.time = 1.0 / psa_sequence.fps
-                psa.keys.append(key)
+            for pose_bone, parent_pose_bone in zip(pose_bones, parent_pose_bones):
+                location, rotation = _get_pose_bone_location_and_rotation(pose_bone, parent_pose_bone, armature_object, options)
+                Psa.KEY_STRUCT.pack_into(sequence_keys, key_offset,
+                                         location.x, location.y, location.z,
+                                         rotation.x, rotation.y, rotation.z, rotation.w,
+                                         key_time)
+                key_offset += Psa.KEY_STRUCT.size
 
             frame += frame_step
 
+        keys.append(sequence_keys)
+
         frame_start_index += frame_count
 
         psa.sequences[export_sequence.name] = psa_sequence
 
         context.window_manager.progress_update(export_sequence_index)
 
+    if len(keys) > 0:
+        psa.keys = np.concatenate(keys)
+
     # Restore the previous action & frame.
     options.animation_data.action = saved_action
     context.scene.frame_set(saved_frame_current)
@@ -1,7 +1,10 @@
+import struct
 import typing
 from collections import OrderedDict
 from typing import List
 
+import numpy as np
+
 from ..shared.data import *
 
 '''
@@ -58,7 +61,24 @@ class Psa:
         def __repr__(self) -> str:
             return repr((self.location, self.rotation, self.time))
 
+    # NumPy equivalent of the Psa.Key structure, used to build and write the key data in bulk.
+    KEY_DTYPE = np.dtype([
+        ('location', '<f4', (3,)),
+        ('rotation', '<f4', (4,)),
+        ('time', '<f4')
+    ])
+
+    # Packs the fields of a Psa.Key (location XYZ, rotation XYZW, time) directly into a buffer.
+    KEY_STRUCT = struct.Struct('<3f4ff')
+
     def __init__(self):
         self.bones: List[Psa.Bone] = []
         self.sequences: typing.OrderedDict[str, Psa.Sequence] = OrderedDict()
-        self.keys: List[Psa.Key] = []
+        self.keys: np.ndarray = np.zeros(0, dtype=Psa.KEY_DTYPE)
+
+
+# Keys are built with KEY_STRUCT, stored as KEY_DTYPE arrays and written under a Psa.Key section header, so all three
+# must describe the same record. Otherwise, the written key data would be silently corrupt.
+if not (Psa.KEY_DTYPE.itemsize == Psa.KEY_STRUCT.size == sizeof(Psa.Key)):
+    raise RuntimeError(f'PSA key record sizes do not match (dtype: {Psa.KEY_DTYPE.itemsize}, '
+                       f'struct: {Psa.KEY_STRUCT.size}, structure: {sizeof(Psa.Key)})')
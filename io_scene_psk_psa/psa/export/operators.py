@@ -1,6 +1,5 @@
 import re
-from collections import Counter
-from typing import List, Iterable, Dict, Tuple
+from typing import List, Iterable, Dict, Tuple, FrozenSet
 
 import bpy
 from bpy.props import StringProperty
@@ -8,22 +7,31 @@ from bpy.types import Context, Armature, Action, Object, AnimData, TimelineMarke
 from bpy_extras.io_utils import ExportHelper
 from bpy_types import Operator
 
-from .properties import PSA_PG_export, PSA_PG_export_action_list_item, filter_sequences
+from .properties import PSA_PG_export, PSA_PG_export_action_list_item, filter_sequences, \
+    clear_filter_sequences_cache, clear_duplicate_action_name_cache, get_duplicate_action_name
 from ..builder import build_psa, PsaBuildSequence, PsaBuildOptions
 from ..writer import write_psa
-from ...shared.helpers import populate_bone_collection_list, get_nla_strips_in_frame_range
+from ...shared.helpers import populate_bone_collection_list, get_nla_strips_in_frame_range, \
+    get_pose_bone_name_from_data_path
 
 
-def is_action_for_armature(armature: Armature, action: Action):
+def is_action_for_armature(bone_names: FrozenSet[str], action: Action):
+    """
+    @param bone_names: The names of the bones in the armature.
+    @param action: The action to check.
+    @return: True if the action animates any of the given bones.
+    """
     if len(action.fcurves) == 0:
         return False
-    bone_names = set([x.name for x in armature.bones])
+    # Bone f-curves are typically grouped by bone name, and there are far fewer groups than f-curves, so check the groups
+    # first. A group only counts if it actually contains a pose bone channel, since other channels (e.g., custom
+    # properties) can share a bone's name. Actions without such groups fall through to scanning the f-curves.
+    for group in action.groups:
+        if group.name in bone_names and len(group.channels) > 0 and \
+                get_pose_bone_name_from_data_path(group.channels[0].data_path) in bone_names:
+            return True
     for fcurve in action.fcurves:
-        match = re.match(r'pose\.bones\[\"([^\"]+)\"](\[\"([^\"]+)\"])?', fcurve.data_path)
-        if not match:
-            continue
-        bone_name = match.group(1)
-        if bone_name in bone_names:
+        if get_pose_bone_name_from_data_path(fcurve.data_path) in bone_names:
             return True
     return False
 
@@ -31,20 +39,23 @@ def is_action_for_armature(armature: Armature, action: Action):
 def update_actions_and_timeline_markers(context: Context, armature: Armature):
     pg = getattr(context.scene, 'psa_export')
 
-    # Clear actions and markers.
-    pg.action_list.clear()
-    pg.marker_list.clear()
-
     # Get animation data.
     animation_data_object = get_animation_data_object(context)
     animation_data = animation_data_object.animation_data if animation_data_object else None
 
+    # Clear actions and markers.
+    clear_filter_sequences_cache()
+    clear_duplicate_action_name_cache()
+    pg.action_list.clear()
+    pg.marker_list.clear()
+
     if animation_data is None:
         return
 
     # Populate actions list.
+    bone_names = frozenset(x.name for x in armature.bones)
     for action in bpy.data.actions:
-        if not is_action_for_armature(armature, action):
+        if not is_action_for_armature(bone_names, action):
             continue
 
         if action.name != '' and not action.name.startswith('#'):
@@ -54,6 +65,7 @@ def update_actions_and_timeline_markers(context: Context, armature: Armature):
                 item.name = name
                 item.is_selected = False
                 item.is_pose_marker = False
+                item.is_asset = action.asset_data is not None
                 item.frame_start = frame_start
                 item.frame_end = frame_end
 
@@ -68,6 +80,7 @@ def update_actions_and_timeline_markers(context: Context, armature: Armature):
                 item.name = name
                 item.is_selected = False
                 item.is_pose_marker = True
+                item.is_asset = action.asset_data is not None
                 item.frame_start = frame_start
                 item.frame_end = frame_end
 
@@ -202,6 +215,19 @@ def get_sequences_from_action_pose_markers(action: Action, pose_markers: List[Ti
     return get_sequences_from_name_and_frame_range(sequence_name, frame_start, frame_end)
 
 
+def get_sequence_item_list(pg: PSA_PG_export):
+    """
+    Returns the list of sequence items for the current sequence source.
+    """
+    if pg.sequence_source == 'ACTIONS':
+        return pg.action_list
+    elif pg.sequence_source == 'TIMELINE_MARKERS':
+        return pg.marker_list
+    elif pg.sequence_source == 'NLA_TRACK_STRIPS':
+        return pg.nla_strip_list
+    return None
+
+
 def get_visible_sequences(pg: PSA_PG_export, sequences) -> List[PSA_PG_export_action_list_item]:
     visible_sequences = []
     for i, flag in enumerate(filter_sequences(pg, sequences)):
@@ -239,6 +265,9 @@ class PSA_OT_export(Operator, ExportHelper):
         layout = self.layout
         pg = getattr(context.scene, 'psa_export')
 
+        # The sequences may have changed since the last redraw.
+        clear_filter_sequences_cache()
+
         sequences_header, sequences_panel = layout.panel('Sequences', default_closed=False)
         sequences_header.label(text='Sequences', icon='ACTION')
 
@@ -284,13 +313,9 @@ class PSA_OT_export(Operator, ExportHelper):
             flow.prop(pg, 'sequence_name_suffix')
 
             # Determine if there is going to be a naming conflict and display an error, if so.
-            selected_items = [x for x in pg.action_list if x.is_selected]
-            action_names = [x.name for x in selected_items]
-            action_name_counts = Counter(action_names)
-            for action_name, count in action_name_counts.items():
-                if count > 1:
-                    layout.label(text=f'Duplicate action: {action_name}', icon='ERROR')
-                    break
+            duplicate_action_name = get_duplicate_action_name(pg)
+            if duplicate_action_name is not None:
+                layout.label(text=f'Duplicate action: {duplicate_action_name}', icon='ERROR')
 
             # FPS
             flow.prop(pg, 'fps_source')
@@ -316,6 +341,8 @@ class PSA_OT_export(Operator, ExportHelper):
             flow = bones_panel.grid_flow()
             flow.use_property_split = True
             flow.use_property_decorate = False
+            if pg.bone_filter_mode == 'BONE_COLLECTIONS':
+                flow.prop(pg, 'should_prune_unused_ancestors')
             flow.prop(pg, 'should_enforce_bone_name_restrictions')
 
         # ADVANCED
@@ -426,6 +453,7 @@ class PSA_OT_export(Operator, ExportHelper):
         options.sequence_name_prefix = pg.sequence_name_prefix
         options.sequence_name_suffix = pg.sequence_name_suffix
         options.root_motion = pg.root_motion
+        options.should_prune_unused_ancestors = pg.should_prune_unused_ancestors
 
         try:
             psa = build_psa(context, options)
@@ -445,28 +473,17 @@ class PSA_OT_export_actions_select_all(Operator):
     bl_description = 'Select all visible sequences'
     bl_options = {'INTERNAL'}
 
-    @classmethod
-    def get_item_list(cls, context):
-        pg = context.scene.psa_export
-        if pg.sequence_source == 'ACTIONS':
-            return pg.action_list
-        elif pg.sequence_source == 'TIMELINE_MARKERS':
-            return pg.marker_list
-        elif pg.sequence_source == 'NLA_TRACK_STRIPS':
-            return pg.nla_strip_list
-        return None
-
     @classmethod
     def poll(cls, context):
         pg = getattr(context.scene, 'psa_export')
-        item_list = cls.get_item_list(context)
+        item_list = get_sequence_item_list(pg)
         visible_sequences = get_visible_sequences(pg, item_list)
         has_unselected_sequences = any(map(lambda item: not item.is_selected, visible_sequences))
         return has_unselected_sequences
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
-        sequences = self.get_item_list(context)
+        sequences = get_sequence_item_list(pg)
         for sequence in get_visible_sequences(pg, sequences):
             sequence.is_selected = True
         return {'FINISHED'}
@@ -478,26 +495,16 @@ class PSA_OT_export_actions_deselect_all(Operator):
     bl_description = 'Deselect all visible sequences'
     bl_options = {'INTERNAL'}
 
-    @classmethod
-    def get_item_list(cls, context):
-        pg = context.scene.psa_export
-        if pg.sequence_source == 'ACTIONS':
-            return pg.action_list
-        elif pg.sequence_source == 'TIMELINE_MARKERS':
-            return pg.marker_list
-        elif pg.sequence_source == 'NLA_TRACK_STRIPS':
-            return pg.nla_strip_list
-        return None
-
     @classmethod
     def poll(cls, context):
-        item_list = cls.get_item_list(context)
+        pg = getattr(context.scene, 'psa_export')
+        item_list = get_sequence_item_list(pg)
         has_selected_items = any(map(lambda item: item.is_selected, item_list))
         return len(item_list) > 0 and has_selected_items
 
     def execute(self, context):
         pg = getattr(context.scene, 'psa_export')
-        item_list = self.get_item_list(context)
+        item_list = get_sequence_item_list(pg)
         for sequence in get_visible_sequences(pg, item_list):
             sequence.is_selected = False
         return {'FINISHED'}
@@ -1,7 +1,8 @@
+import os
 import re
 import sys
-from fnmatch import fnmatch
-from typing import List, Optional
+from fnmatch import translate
+from typing import List, Optional, Dict, Tuple
 
 from bpy.props import BoolProperty, PointerProperty, EnumProperty, FloatProperty, CollectionProperty, IntProperty, \
     StringProperty
@@ -16,14 +17,49 @@ def psa_export_property_group_animation_data_override_poll(_context, obj):
 
 empty_set = set()
 
+# The first duplicate name amongst the selected items of an action list, keyed by the pointer of the owning property
+# group. Entries are invalidated whenever the name or selection state of any action list item changes, whenever the
+# action list is rebuilt, and on undo & redo, so that the export dialog does not need to check for duplicates on every
+# redraw.
+_duplicate_action_name_cache: Dict[int, Optional[str]] = dict()
+
+
+def clear_duplicate_action_name_cache():
+    _duplicate_action_name_cache.clear()
+
+
+def action_list_item_update_cb(self: 'PSA_PG_export_action_list_item', context: Context) -> None:
+    clear_duplicate_action_name_cache()
+
+
+def get_duplicate_action_name(pg: 'PSA_PG_export') -> Optional[str]:
+    """
+    Returns the name of the first selected action that shares its name with another selected action, or None if there
+    are no duplicates.
+    """
+    key = pg.as_pointer()
+    if key not in _duplicate_action_name_cache:
+        duplicate_action_name = None
+        selected_action_names = set()
+        for item in pg.action_list:
+            if not item.is_selected:
+                continue
+            if item.name in selected_action_names:
+                duplicate_action_name = item.name
+                break
+            selected_action_names.add(item.name)
+        _duplicate_action_name_cache[key] = duplicate_action_name
+    return _duplicate_action_name_cache[key]
+
 
 class PSA_PG_export_action_list_item(PropertyGroup):
     action: PointerProperty(type=Action)
-    name: StringProperty()
-    is_selected: BoolProperty(default=True)
+    name: StringProperty(update=action_list_item_update_cb)
+    is_selected: BoolProperty(default=True, update=action_list_item_update_cb)
     frame_start: IntProperty(options={'HIDDEN'})
     frame_end: IntProperty(options={'HIDDEN'})
     is_pose_marker: BoolProperty(options={'HIDDEN'})
+    is_asset: BoolProperty(options={'HIDDEN'})
 
 
 class PSA_PG_export_timeline_markers(PropertyGroup):  # TODO: rename this to singular
@@ -43,6 +79,7 @@ class PSA_PG_export_nla_strip_list_item(PropertyGroup):
 
 
 def nla_track_update_cb(self: 'PSA_PG_export', context: Context) -> None:
+    clear_filter_sequences_cache()
     self.nla_strip_list.clear()
     match = re.match(r'^(\d+).+$', self.nla_track)
     self.nla_track_index = int(match.group(1)) if match else -1
@@ -149,6 +186,14 @@ class PSA_PG_export(PropertyGroup):
     )
     bone_collection_list: CollectionProperty(type=PSX_PG_bone_collection_list_item)
     bone_collection_list_index: IntProperty(default=0, name='', description='')
+    should_prune_unused_ancestors: BoolProperty(
+        default=False,
+        name='Prune Unused Ancestors',
+        options=empty_set,
+        description='Ancestors of the bones in the selected bone collections will only be exported if they, or one of '
+                    'their own ancestors, are animated by the exported sequences. This reduces the size of the file. '
+                    'The export will fail if the remaining bone hierarchy does not have a single root bone'
+    )
     should_enforce_bone_name_restrictions: BoolProperty(
         default=False,
         name='Enforce Bone Name Restrictions',
@@ -185,35 +230,76 @@ class PSA_PG_export(PropertyGroup):
     )
 
 
+# The results of `filter_sequences`, keyed by the sequence list and filter settings. The sequence list and the select
+# all/none operators each filter the same sequences during a single redraw, so the results are memoized here. This must
+# be cleared whenever the sequence lists are changed (and is cleared at the start of every redraw).
+_filter_sequences_cache: Dict[Tuple, List[int]] = dict()
+
+
+def clear_filter_sequences_cache():
+    _filter_sequences_cache.clear()
+
+
 def filter_sequences(pg: PSA_PG_export, sequences) -> List[int]:
+    cache_key = (
+        pg.as_pointer(),
+        pg.sequence_source,
+        len(sequences),
+        pg.sequence_filter_name,
+        pg.sequence_use_filter_invert,
+        pg.sequence_filter_asset,
+        pg.sequence_filter_pose_marker,
+        pg.sequence_filter_reversed,
+    )
+    flt_flags = _filter_sequences_cache.get(cache_key, None)
+    if flt_flags is None:
+        flt_flags = _filter_sequences(pg, sequences)
+        _filter_sequences_cache[cache_key] = flt_flags
+    return flt_flags
+
+
+def _filter_sequences(pg: PSA_PG_export, sequences) -> List[int]:
     bitflag_filter_item = 1 << 30
-    flt_flags = [bitflag_filter_item] * len(sequences)
+    flt_flags = [0] * len(sequences)
 
+    pattern = None
     if pg.sequence_filter_name:
         # Filter name is non-empty.
-        for i, sequence in enumerate(sequences):
-            if not fnmatch(sequence.name, f'*{pg.sequence_filter_name}*'):
-                flt_flags[i] &= ~bitflag_filter_item
-
-        # Invert filter flags for all items.
-        if pg.sequence_use_filter_invert:
-            for i, sequence in enumerate(sequences):
-                flt_flags[i] ^= bitflag_filter_item
-
-    if not pg.sequence_filter_asset:
-        for i, sequence in enumerate(sequences):
-            if hasattr(sequence, 'action') and sequence.action is not None and sequence.action.asset_data is not None:
-                flt_flags[i] &= ~bitflag_filter_item
-
-    if not pg.sequence_filter_pose_marker:
-        for i, sequence in enumerate(sequences):
-            if hasattr(sequence, 'is_pose_marker') and sequence.is_pose_marker:
-                flt_flags[i] &= ~bitflag_filter_item
-
-    if not pg.sequence_filter_reversed:
-        for i, sequence in enumerate(sequences):
+        # Translate the wildcard pattern once instead of once per item (which is what `fnmatch` would do).
+        # The names are normalized with `os.path.normcase` to match the behavior of `fnmatch`.
+        pattern = re.compile(translate(os.path.normcase(f'*{pg.sequence_filter_name}*')))
+
+    # The sequences are items of the list for the current sequence source, so we know up-front which filters apply to
+    # them. Only actions and NLA strips reference an action, and only actions can come from pose markers.
+    use_filter_invert = pg.sequence_use_filter_invert
+    should_filter_assets = not pg.sequence_filter_asset and pg.sequence_source in {'ACTIONS', 'NLA_TRACK_STRIPS'}
+    # The action list is rebuilt every time the export dialog is opened, so its items store whether they are assets.
+    # The NLA strip list is not, so the asset state of its actions has to be checked live.
+    is_asset_stored = pg.sequence_source == 'ACTIONS'
+    should_filter_pose_markers = not pg.sequence_filter_pose_marker and pg.sequence_source == 'ACTIONS'
+    show_reversed = pg.sequence_filter_reversed
+
+    # All the filters are applied in a single pass over the sequences.
+    for i, sequence in enumerate(sequences):
+        is_visible = True
+        if pattern is not None:
+            # Note that inversion only applies to the name filter.
+            is_visible = (pattern.match(os.path.normcase(sequence.name)) is not None) != use_filter_invert
+        if is_visible and should_filter_assets:
+            if is_asset_stored:
+                is_asset = sequence.is_asset
+            else:
+                is_asset = sequence.action is not None and sequence.action.asset_data is not None
+            if is_asset:
+                is_visible = False
+        if is_visible and should_filter_pose_markers:
+            if sequence.is_pose_marker:
+                is_visible = False
+        if is_visible and not show_reversed:
             if sequence.frame_start > sequence.frame_end:
-                flt_flags[i] &= ~bitflag_filter_item
+                is_visible = False
+        if is_visible:
+            flt_flags[i] = bitflag_filter_item
 
     return flt_flags
 
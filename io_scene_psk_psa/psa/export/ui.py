@@ -10,7 +10,9 @@ class PSA_UL_export_sequences(UIList):
     def __init__(self):
         super(PSA_UL_export_sequences, self).__init__()
         # Show the filtering options by default.
-        self.use_filter_show = True
+        # Blender may re-instantiate the list frequently, so avoid writing the property if it is already set.
+        if not self.use_filter_show:
+            self.use_filter_show = True
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         item = cast(PSA_PG_export_action_list_item, item)
@@ -1,9 +1,9 @@
 import typing
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
 
 import bpy
 import numpy as np
-from bpy.types import FCurve, Object, Context
+from bpy.types import FCurve, Object, Context, Action
 from mathutils import Vector, Quaternion
 
 from .config import PsaConfig, REMOVE_TRACK_LOCATION, REMOVE_TRACK_ROTATION
@@ -12,6 +12,23 @@ from .reader import PsaReader
 
 
 class PsaImportOptions(object):
+    __slots__ = (
+        'should_use_fake_user',
+        'should_stash',
+        'sequence_names',
+        'should_overwrite',
+        'should_write_keyframes',
+        'should_write_metadata',
+        'action_name_prefix',
+        'should_convert_to_samples',
+        'bone_mapping_mode',
+        'fps_source',
+        'fps_custom',
+        'translation_scale',
+        'should_use_config_file',
+        'psa_config',
+    )
+
     def __init__(self):
         self.should_use_fake_user = False
         self.should_stash = False
@@ -30,6 +47,21 @@ class PsaImportOptions(object):
 
 
 class ImportBone(object):
+    __slots__ = (
+        'psa_bone',
+        'parent',
+        'armature_bone',
+        'pose_bone',
+        'original_location',
+        'original_rotation',
+        'post_rotation',
+        'rotation_data_path',
+        'location_data_path',
+        'transform_matrix',
+        'transform_offset',
+        'fcurves',
+    )
+
     def __init__(self, psa_bone: Psa.Bone):
         self.psa_bone: Psa.Bone = psa_bone
         self.parent: Optional[ImportBone] = None
@@ -38,47 +70,189 @@ class ImportBone(object):
         self.original_location: Vector = Vector()
         self.original_rotation: Quaternion = Quaternion()
         self.post_rotation: Quaternion = Quaternion()
+        self.rotation_data_path: str = ''
+        self.location_data_path: str = ''
+        self.transform_matrix: np.ndarray = np.identity(7)
+        self.transform_offset: np.ndarray = np.zeros(7)
         self.fcurves: List[FCurve] = []
 
 
-def _calculate_fcurve_data(import_bone: ImportBone, key_data: typing.Iterable[float]):
-    # Convert world-space transforms to local-space transforms.
-    key_rotation = Quaternion(key_data[0:4])
-    key_location = Vector(key_data[4:])
-    q = import_bone.post_rotation.copy()
-    q.rotate(import_bone.original_rotation)
-    rotation = q
-    q = import_bone.post_rotation.copy()
-    if import_bone.parent is None:
-        q.rotate(key_rotation.conjugated())
-    else:
-        q.rotate(key_rotation)
-    rotation.rotate(q.conjugated())
-    location = key_location - import_bone.original_location
-    location.rotate(import_bone.post_rotation.conjugated())
-    return rotation.w, rotation.x, rotation.y, rotation.z, location.x, location.y, location.z
+def _quaternion_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Returns the Hamilton products of two (broadcastable) arrays of WXYZ quaternions.
+    """
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def _quaternion_conjugate(q: np.ndarray) -> np.ndarray:
+    return q * np.array((1.0, -1.0, -1.0, -1.0))
+
+
+def _quaternion_rotate_vector(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Rotates an array of vectors by a (broadcastable) array of unit WXYZ quaternions.
+    """
+    u = q[..., 1:]
+    t = 2.0 * np.cross(u, v)
+    return v + q[..., :1] * t + np.cross(u, t)
+
+
+def _quaternion_left_multiply_matrix(q: np.ndarray) -> np.ndarray:
+    """
+    Returns the 4x4 matrices that, when applied to a WXYZ quaternion b, compute the Hamilton product q * b.
+    """
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack((
+        np.stack((w, -x, -y, -z), axis=-1),
+        np.stack((x, w, -z, y), axis=-1),
+        np.stack((y, z, w, -x), axis=-1),
+        np.stack((z, -y, x, w), axis=-1),
+    ), axis=-2)
+
+
+def _quaternion_right_multiply_matrix(q: np.ndarray) -> np.ndarray:
+    """
+    Returns the 4x4 matrices that, when applied to a WXYZ quaternion b, compute the Hamilton product b * q.
+    """
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack((
+        np.stack((w, -x, -y, -z), axis=-1),
+        np.stack((x, w, z, -y), axis=-1),
+        np.stack((y, -z, w, x), axis=-1),
+        np.stack((z, y, -x, w), axis=-1),
+    ), axis=-2)
+
+
+def _quaternion_to_rotation_matrix(q: np.ndarray) -> np.ndarray:
+    """
+    Returns the 3x3 rotation matrices of an array of unit WXYZ quaternions.
+    """
+    # The columns of a rotation matrix are the rotated basis vectors.
+    return np.swapaxes(_quaternion_rotate_vector(q[..., np.newaxis, :], np.eye(3)), -1, -2)
+
+
+def _set_local_space_transforms(import_bones: List[ImportBone]):
+    """
+    Calculates and stores the affine transform that converts the world-space key data of each import bone to
+    local-space. The transforms only depend on the armature, so they only need to be calculated once per import.
+    @param import_bones: The import bones. Unlike elsewhere, this must not contain None entries.
+    """
+    if len(import_bones) == 0:
+        return
+
+    # Per-bone data, each with a leading dimension of B (the number of import bones).
+    original_rotations = np.array([tuple(x.original_rotation) for x in import_bones])
+    post_rotations = np.array([tuple(x.post_rotation) for x in import_bones])
+    original_locations = np.array([tuple(x.original_location) for x in import_bones])
+    is_root = np.array([x.parent is None for x in import_bones])
+
+    # rotation = conjugate(key_rotation * post_rotation) * (original_rotation * post_rotation)
+    #          = conjugate(post_rotation) * conjugate(key_rotation) * (original_rotation * post_rotation)
+    # Everything but the key rotation is constant for each bone, so the whole transform is folded into a single 4x4
+    # matrix per bone. Root key rotations are conjugated up-front, so the two conjugations cancel out for root bones.
+    key_conjugation = np.where(is_root[:, np.newaxis], 1.0, np.array((1.0, -1.0, -1.0, -1.0)))
+    rotation_matrices = (
+        _quaternion_left_multiply_matrix(_quaternion_conjugate(post_rotations)) @
+        _quaternion_right_multiply_matrix(_quaternion_multiply(original_rotations, post_rotations)) *
+        key_conjugation[:, np.newaxis, :]
+    )
+
+    # location = rotate(conjugate(post_rotation), key_location - original_location)
+    location_matrices = _quaternion_to_rotation_matrix(_quaternion_conjugate(post_rotations))
+
+    # Combine both into a single affine 7x7 transform per bone so that all the keys are transformed in one pass.
+    transform_matrices = np.zeros((len(import_bones), 7, 7))
+    transform_matrices[:, :4, :4] = rotation_matrices
+    transform_matrices[:, 4:, 4:] = location_matrices
+    transform_offsets = np.zeros((len(import_bones), 7))
+    transform_offsets[:, 4:] = -(location_matrices @ original_locations[..., np.newaxis])[..., 0]
+
+    for import_bone, transform_matrix, transform_offset in zip(import_bones, transform_matrices, transform_offsets):
+        import_bone.transform_matrix = transform_matrix
+        import_bone.transform_offset = transform_offset
+
+
+def _calculate_fcurve_data_batch(sequence_data_matrix: np.ndarray, bone_indices: List[int], transform_matrices: np.ndarray, transform_offsets: np.ndarray):
+    """
+    Converts the world-space key data of the sequence data matrix to local-space, in-place, for every frame of the
+    given bones. The data of all other bones is left untouched.
+    @param sequence_data_matrix: FxBx7 matrix where F is the number of frames and B is the number of bones.
+    @param bone_indices: The indices of the PSA bones that are mapped to armature bones.
+    @param transform_matrices: The 7x7 local-space transform matrix of each of the bones in bone_indices.
+    @param transform_offsets: The local-space transform offset of each of the bones in bone_indices.
+    """
+    if len(bone_indices) == 0:
+        return
+
+    key_data = sequence_data_matrix[:, bone_indices, :, np.newaxis]
+    key_data = (transform_matrices @ key_data)[..., 0] + transform_offsets
+
+    # mathutils keeps the W component of rotated quaternions non-negative, so we do the same.
+    key_data[key_data[..., 0] < 0.0, :4] *= -1.0
+
+    sequence_data_matrix[:, bone_indices] = key_data
 
 
 class PsaImportResult:
+    __slots__ = ('warnings',)
+
     def __init__(self):
         self.warnings: List[str] = []
 
 
-def _get_armature_bone_index_for_psa_bone(psa_bone_name: str, armature_bone_names: List[str], bone_mapping_mode: str = 'EXACT') -> Optional[int]:
+def _get_bone_mapping_key(bone_name: str, bone_mapping_mode: str) -> str:
+    """
+    @param bone_name: The name of the bone.
+    @param bone_mapping_mode: One of 'EXACT' or 'CASE_INSENSITIVE'.
+    @return: The key used to match the bone by name with the given bone mapping mode.
+    """
+    return bone_name.lower() if bone_mapping_mode == 'CASE_INSENSITIVE' else bone_name
+
+
+def _get_armature_bone_indices_by_key(armature_bone_names: List[str], bone_mapping_mode: str = 'EXACT') -> Dict[str, int]:
     """
-    @param psa_bone_name: The name of the PSA bone.
     @param armature_bone_names: The names of the bones in the armature.
     @param bone_mapping_mode: One of 'EXACT' or 'CASE_INSENSITIVE'.
-    @return: The index of the armature bone that corresponds to the given PSA bone, or None if no such bone exists.
+    @return: A mapping of bone mapping keys to armature bone indices. If multiple armature bones share a key, the first
+    one is used.
     """
+    armature_bone_indices = dict()
     for armature_bone_index, armature_bone_name in enumerate(armature_bone_names):
-        if bone_mapping_mode == 'CASE_INSENSITIVE':
-            if armature_bone_name.lower() == psa_bone_name.lower():
-                return armature_bone_index
-        else:
-            if armature_bone_name == psa_bone_name:
-                return armature_bone_index
-    return None
+        armature_bone_indices.setdefault(_get_bone_mapping_key(armature_bone_name, bone_mapping_mode), armature_bone_index)
+    return armature_bone_indices
+
+
+def _get_or_create_fcurve(action: Action, existing_fcurves: Dict[Tuple[str, int], FCurve], data_path: str, index: int, action_group: str) -> FCurve:
+    """
+    Returns the existing f-curve for the data path and index, removing it from `existing_fcurves`, or creates a new one
+    if there is no such f-curve.
+    Re-used f-curves have the state that affects their evaluation reset so that they behave like new f-curves.
+    """
+    fcurve = existing_fcurves.pop((data_path, index), None)
+    if fcurve is not None and (fcurve.group is None or fcurve.group.name != action_group):
+        # The f-curve belongs to a different group, so replace it instead.
+        action.fcurves.remove(fcurve)
+        fcurve = None
+    if fcurve is None:
+        return action.fcurves.new(data_path, index=index, action_group=action_group)
+    fcurve.extrapolation = 'CONSTANT'
+    fcurve.mute = False
+    return fcurve
+
+
+def _get_or_create_fcurves(action: Action, existing_fcurves: Dict[Tuple[str, int], FCurve], data_path: str, count: int, action_group: str) -> List[FCurve]:
+    """
+    Returns the f-curves for the first `count` indices of the data path, re-using existing f-curves where possible.
+    """
+    return [_get_or_create_fcurve(action, existing_fcurves, data_path, index, action_group) for index in range(count)]
+
 
 def _get_sample_frame_times(source_frame_count: int, frame_step: float) -> typing.Iterable[float]:
     # TODO: for correctness, we should also emit the target frame time as well (because the last frame can be a
@@ -102,27 +276,40 @@ def _resample_sequence_data_matrix(sequence_data_matrix: np.ndarray, frame_step:
         # No resampling is necessary.
         return sequence_data_matrix
 
-    source_frame_count, bone_count = sequence_data_matrix.shape[:2]
-    sample_frame_times = list(_get_sample_frame_times(source_frame_count, frame_step))
-    target_frame_count = len(sample_frame_times)
-    resampled_sequence_data_matrix = np.zeros((target_frame_count, bone_count, 7), dtype=float)
-
-    for sample_frame_index, sample_frame_time in enumerate(sample_frame_times):
-        frame_index = int(sample_frame_time)
-        if sample_frame_time % 1.0 == 0.0:
-            # Sample time has no fractional part, so just copy the frame.
-            resampled_sequence_data_matrix[sample_frame_index, :, :] = sequence_data_matrix[frame_index, :, :]
-        else:
-            # Sample time has a fractional part, so interpolate between two frames.
-            next_frame_index = frame_index + 1
-            for bone_index in range(bone_count):
-                source_frame_1_data = sequence_data_matrix[frame_index, bone_index, :]
-                source_frame_2_data = sequence_data_matrix[next_frame_index, bone_index, :]
-                factor = sample_frame_time - frame_index
-                q = Quaternion((source_frame_1_data[:4])).slerp(Quaternion((source_frame_2_data[:4])), factor)
-                q.normalize()
-                l = Vector(source_frame_1_data[4:]).lerp(Vector(source_frame_2_data[4:]), factor)
-                resampled_sequence_data_matrix[sample_frame_index, bone_index, :] = q.w, q.x, q.y, q.z, l.x, l.y, l.z
+    source_frame_count = sequence_data_matrix.shape[0]
+    sample_frame_times = np.fromiter(_get_sample_frame_times(source_frame_count, frame_step), dtype=float)
+    frame_indices = sample_frame_times.astype(int)
+    next_frame_indices = np.minimum(frame_indices + 1, source_frame_count - 1)
+    factors = (sample_frame_times - frame_indices)[:, np.newaxis, np.newaxis]
+
+    # Interpolate all the samples between their two source frames at once, the same way that mathutils does.
+    source_frame_1_data = sequence_data_matrix[frame_indices]
+    source_frame_2_data = sequence_data_matrix[next_frame_indices]
+    q1 = source_frame_1_data[..., :4]
+    q2 = source_frame_2_data[..., :4]
+    l1 = source_frame_1_data[..., 4:]
+    l2 = source_frame_2_data[..., 4:]
+
+    # Rotate around the shortest angle.
+    cosom = np.sum(q1 * q2, axis=-1, keepdims=True)
+    q1 = np.where(cosom < 0.0, -q1, q1)
+    cosom = np.abs(cosom)
+
+    # Fall back to linear interpolation when the quaternions are nearly identical.
+    is_slerp = (1.0 - cosom) > 0.0001
+    omega = np.arccos(np.minimum(cosom, 1.0))
+    sinom = np.where(is_slerp, np.sin(omega), 1.0)
+    scale_1 = np.where(is_slerp, np.sin((1.0 - factors) * omega) / sinom, 1.0 - factors)
+    scale_2 = np.where(is_slerp, np.sin(factors * omega) / sinom, factors)
+    q = scale_1 * q1 + scale_2 * q2
+    q /= np.linalg.norm(q, axis=-1, keepdims=True)
+    l = (1.0 - factors) * l1 + factors * l2
+
+    resampled_sequence_data_matrix = np.concatenate((q, l), axis=-1)
+
+    # Samples with no fractional part are just copies of their source frame.
+    is_whole_frame = factors[:, 0, 0] == 0.0
+    resampled_sequence_data_matrix[is_whole_frame] = sequence_data_matrix[frame_indices[is_whole_frame]]
 
     return resampled_sequence_data_matrix
 
@@ -136,23 +323,41 @@ def import_psa(context: Context, psa_reader: PsaReader, armature_object: Object,
     psa_to_armature_bone_indices = {}
     armature_to_psa_bone_indices = {}
     armature_bone_names = [x.name for x in armature_data.bones]
+    armature_bone_indices_by_key = _get_armature_bone_indices_by_key(armature_bone_names, options.bone_mapping_mode)
     psa_bone_names = []
     duplicate_mappings = []
+    missing_bone_names = set()
+
+    # Create intermediate bone data for import operations.
+    import_bones = []
+    psa_bone_names_to_import_bones = dict()
 
     for psa_bone_index, psa_bone in enumerate(psa_reader.bones):
         psa_bone_name: str = psa_bone.name.decode('windows-1252')
-        armature_bone_index = _get_armature_bone_index_for_psa_bone(psa_bone_name, armature_bone_names, options.bone_mapping_mode)
-        if armature_bone_index is not None:
-            # Ensure that no other PSA bone has been mapped to this armature bone yet.
-            if armature_bone_index not in armature_to_psa_bone_indices:
-                psa_to_armature_bone_indices[psa_bone_index] = armature_bone_index
-                armature_to_psa_bone_indices[armature_bone_index] = psa_bone_index
-            else:
-                # This armature bone has already been mapped to a PSA bone.
-                duplicate_mappings.append((psa_bone_index, armature_bone_index, armature_to_psa_bone_indices[armature_bone_index]))
-            psa_bone_names.append(armature_bone_names[armature_bone_index])
-        else:
+        armature_bone_index = armature_bone_indices_by_key.get(_get_bone_mapping_key(psa_bone_name, options.bone_mapping_mode), None)
+        if armature_bone_index is None:
+            # PSA bone does not map to armature bone, skip it and leave an empty bone in its place.
             psa_bone_names.append(psa_bone_name)
+            missing_bone_names.add(psa_bone_name)
+            import_bones.append(None)
+            continue
+        psa_bone_name = armature_bone_names[armature_bone_index]
+        psa_bone_names.append(psa_bone_name)
+        # Ensure that no other PSA bone has been mapped to this armature bone yet.
+        if armature_bone_index in armature_to_psa_bone_indices:
+            # This armature bone has already been mapped to a PSA bone.
+            duplicate_mappings.append((psa_bone_index, armature_bone_index, armature_to_psa_bone_indices[armature_bone_index]))
+            import_bones.append(None)
+            continue
+        psa_to_armature_bone_indices[psa_bone_index] = armature_bone_index
+        armature_to_psa_bone_indices[armature_bone_index] = psa_bone_index
+        import_bone = ImportBone(psa_bone)
+        import_bone.armature_bone = armature_data.bones[armature_bone_index]
+        import_bone.pose_bone = armature_object.pose.bones[psa_bone_name]
+        import_bone.rotation_data_path = import_bone.pose_bone.path_from_id('rotation_quaternion')
+        import_bone.location_data_path = import_bone.pose_bone.path_from_id('location')
+        psa_bone_names_to_import_bones[psa_bone_name] = import_bone
+        import_bones.append(import_bone)
 
     # Warn about duplicate bone mappings.
     if len(duplicate_mappings) > 0:
@@ -163,7 +368,6 @@ def import_psa(context: Context, psa_reader: PsaReader, armature_object: Object,
             result.warnings.append(f'PSA bone {psa_bone_index} ({psa_bone_name}) could not be mapped to armature bone {armature_bone_index} ({armature_bone_name}) because the armature bone is already mapped to PSA bone {mapped_psa_bone_index} ({mapped_psa_bone_name})')
 
     # Report if there are missing bones in the target armature.
-    missing_bone_names = set(psa_bone_names).difference(set(armature_bone_names))
     if len(missing_bone_names) > 0:
         result.warnings.append(
             f'The armature \'{armature_object.name}\' is missing {len(missing_bone_names)} bones that exist in '
@@ -172,29 +376,15 @@ def import_psa(context: Context, psa_reader: PsaReader, armature_object: Object,
         )
     del armature_bone_names
 
-    # Create intermediate bone data for import operations.
-    import_bones = []
-    psa_bone_names_to_import_bones = dict()
-
-    for (psa_bone_index, psa_bone), psa_bone_name in zip(enumerate(psa_reader.bones), psa_bone_names):
-        if psa_bone_index not in psa_to_armature_bone_indices:
-            # PSA bone does not map to armature bone, skip it and leave an empty bone in its place.
-            import_bones.append(None)
-            continue
-        import_bone = ImportBone(psa_bone)
-        import_bone.armature_bone = armature_data.bones[psa_bone_name]
-        import_bone.pose_bone = armature_object.pose.bones[psa_bone_name]
-        psa_bone_names_to_import_bones[psa_bone_name] = import_bone
-        import_bones.append(import_bone)
-
     bones_with_missing_parents = []
 
     for import_bone in filter(lambda x: x is not None, import_bones):
         armature_bone = import_bone.armature_bone
         has_parent = armature_bone.parent is not None
         if has_parent:
-            if armature_bone.parent.name in psa_bone_names:
-                import_bone.parent = psa_bone_names_to_import_bones[armature_bone.parent.name]
+            parent_import_bone = psa_bone_names_to_import_bones.get(armature_bone.parent.name, None)
+            if parent_import_bone is not None:
+                import_bone.parent = parent_import_bone
             else:
                 # Add a warning if the parent bone is not in the PSA.
                 bones_with_missing_parents.append(armature_bone)
@@ -211,19 +401,32 @@ def import_psa(context: Context, psa_reader: PsaReader, armature_object: Object,
 
         import_bone.post_rotation = import_bone.original_rotation.conjugated()
 
+    # Gather the PSA bones that are mapped to armature bones once, so that the unmapped bones can be skipped entirely
+    # when processing each sequence.
+    mapped_bones = [(bone_index, import_bone) for bone_index, import_bone in enumerate(import_bones) if import_bone is not None]
+    mapped_bone_indices = [bone_index for bone_index, _ in mapped_bones]
+    _set_local_space_transforms([import_bone for _, import_bone in mapped_bones])
+    mapped_bone_transform_matrices = np.array([import_bone.transform_matrix for _, import_bone in mapped_bones])
+    mapped_bone_transform_offsets = np.array([import_bone.transform_offset for _, import_bone in mapped_bones])
+
     # Warn about bones with missing parents.
     if len(bones_with_missing_parents) > 0:
         count = len(bones_with_missing_parents)
         message = f'{count} bone(s) have parents that are not present in the PSA:\n' + str([x.name for x in bones_with_missing_parents])
         result.warnings.append(message)
 
+    # The enum value of the 'LINEAR' keyframe interpolation mode, used to set the interpolation of keyframes in bulk.
+    linear_interpolation = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+
     context.window_manager.progress_begin(0, len(sequences))
 
+    # Only update the progress every so often, since each update goes through the window manager.
+    progress_update_interval = max(1, len(sequences) // 100)
+
     # Create and populate the data for new sequences.
     actions = []
-    for sequence_index, sequence in enumerate(sequences):
+    for sequence_index, (sequence_name, sequence) in enumerate(zip(options.sequence_names, sequences)):
         # Add the action.
-        sequence_name = sequence.name.decode('windows-1252')
         action_name = options.action_name_prefix + sequence_name
 
         # Get the bone track flags for this sequence, or an empty dictionary if none exist.
@@ -248,67 +451,94 @@ def import_psa(context: Context, psa_reader: PsaReader, armature_object: Object,
                 raise ValueError(f'Unknown FPS source: {options.fps_source}')
 
         if options.should_write_keyframes:
-            # Remove existing f-curves.
-            action.fcurves.clear()
+            # When overwriting an action, re-use its existing f-curves where possible instead of removing and
+            # re-creating all of them. F-curves that were baked to samples or that have modifiers are not re-used.
+            existing_fcurves = dict()
+            unusable_fcurves = []
+            for fcurve in action.fcurves:
+                if len(fcurve.sampled_points) > 0 or len(fcurve.modifiers) > 0:
+                    unusable_fcurves.append(fcurve)
+                else:
+                    existing_fcurves[(fcurve.data_path, fcurve.array_index)] = fcurve
+
+            if len(existing_fcurves) == 0:
+                # None of the f-curves can be re-used, so remove them all at once.
+                action.fcurves.clear()
+            else:
+                for fcurve in unusable_fcurves:
+                    action.fcurves.remove(fcurve)
 
             # Create f-curves for the rotation and location of each bone.
             for psa_bone_index, armature_bone_index in psa_to_armature_bone_indices.items():
                 bone_track_flags = sequence_bone_track_flags.get(psa_bone_index, 0)
                 import_bone = import_bones[psa_bone_index]
-                pose_bone = import_bone.pose_bone
-                rotation_data_path = pose_bone.path_from_id('rotation_quaternion')
-                location_data_path = pose_bone.path_from_id('location')
-                add_rotation_fcurves = (bone_track_flags & REMOVE_TRACK_ROTATION) == 0
-                add_location_fcurves = (bone_track_flags & REMOVE_TRACK_LOCATION) == 0
-                import_bone.fcurves = [
-                    action.fcurves.new(rotation_data_path, index=0, action_group=pose_bone.name) if add_rotation_fcurves else None,  # Qw
-                    action.fcurves.new(rotation_data_path, index=1, action_group=pose_bone.name) if add_rotation_fcurves else None,  # Qx
-                    action.fcurves.new(rotation_data_path, index=2, action_group=pose_bone.name) if add_rotation_fcurves else None,  # Qy
-                    action.fcurves.new(rotation_data_path, index=3, action_group=pose_bone.name) if add_rotation_fcurves else None,  # Qz
-                    action.fcurves.new(location_data_path, index=0, action_group=pose_bone.name) if add_location_fcurves else None,  # Lx
-                    action.fcurves.new(location_data_path, index=1, action_group=pose_bone.name) if add_location_fcurves else None,  # Ly
-                    action.fcurves.new(location_data_path, index=2, action_group=pose_bone.name) if add_location_fcurves else None,  # Lz
-                ]
-
-            # Read the sequence data matrix from the PSA.
-            sequence_data_matrix = psa_reader.read_sequence_data_matrix(sequence_name)
-
-            if options.translation_scale != 1.0:
-                # Scale the translation data.
-                sequence_data_matrix[:, :, 4:] *= options.translation_scale
-
-            # Convert the sequence's data from world-space to local-space.
-            for bone_index, import_bone in enumerate(import_bones):
-                if import_bone is None:
-                    continue
-                for frame_index in range(sequence.frame_count):
-                    # This bone has writeable keyframes for this frame.
-                    key_data = sequence_data_matrix[frame_index, bone_index]
-                    # Calculate the local-space key data for the bone.
-                    sequence_data_matrix[frame_index, bone_index] = _calculate_fcurve_data(import_bone, key_data)
-
-            # Resample the sequence data to the target FPS.
-            # If the target frame count is the same as the source frame count, this will be a no-op.
-            resampled_sequence_data_matrix = _resample_sequence_data_matrix(sequence_data_matrix,
-                                                                            frame_step=sequence.fps / target_fps)
-
-            # Write the keyframes out.
-            # Note that the f-curve data consists of alternating time and value data.
-            target_frame_count = resampled_sequence_data_matrix.shape[0]
-            fcurve_data = np.zeros(2 * target_frame_count, dtype=float)
-            fcurve_data[0::2] = range(0, target_frame_count)
-
-            for bone_index, import_bone in enumerate(import_bones):
-                if import_bone is None:
-                    continue
-                for fcurve_index, fcurve in enumerate(import_bone.fcurves):
-                    if fcurve is None:
-                        continue
-                    fcurve_data[1::2] = resampled_sequence_data_matrix[:, bone_index, fcurve_index]
-                    fcurve.keyframe_points.add(target_frame_count)
-                    fcurve.keyframe_points.foreach_set('co', fcurve_data)
-                    for fcurve_keyframe in fcurve.keyframe_points:
-                        fcurve_keyframe.interpolation = 'LINEAR'
+                action_group = import_bone.pose_bone.name
+                if (bone_track_flags & REMOVE_TRACK_ROTATION) == 0:
+                    rotation_fcurves = _get_or_create_fcurves(action, existing_fcurves, import_bone.rotation_data_path, 4, action_group)  # Qw, Qx, Qy, Qz
+                else:
+                    rotation_fcurves = [None] * 4
+                if (bone_track_flags & REMOVE_TRACK_LOCATION) == 0:
+                    location_fcurves = _get_or_create_fcurves(action, existing_fcurves, import_bone.location_data_path, 3, action_group)  # Lx, Ly, Lz
+                else:
+                    location_fcurves = [None] * 3
+                import_bone.fcurves = rotation_fcurves + location_fcurves
+
+            # Remove the existing f-curves that were not re-used.
+            for fcurve in existing_fcurves.values():
+                action.fcurves.remove(fcurve)
+
+            # When all the tracks of this sequence were removed, there is nothing to write, so don't bother reading and
+            # transforming the sequence's data.
+            has_fcurves = any(fcurve is not None for _, import_bone in mapped_bones for fcurve in import_bone.fcurves)
+
+            if has_fcurves:
+                # Read the sequence data matrix from the PSA.
+                sequence_data_matrix = psa_reader.read_sequence_data_matrix(sequence_name)
+
+                if options.translation_scale != 1.0:
+                    # Scale the translation data.
+                    sequence_data_matrix[:, :, 4:] *= options.translation_scale
+
+                # Convert the sequence's data from world-space to local-space.
+                _calculate_fcurve_data_batch(sequence_data_matrix, mapped_bone_indices, mapped_bone_transform_matrices,
+                                             mapped_bone_transform_offsets)
+
+                # Resample the sequence data to the target FPS.
+                # If the target frame count is the same as the source frame count, this will be a no-op.
+                resampled_sequence_data_matrix = _resample_sequence_data_matrix(sequence_data_matrix,
+                                                                                frame_step=sequence.fps / target_fps)
+
+                # Write the keyframes out.
+                # Note that the f-curve data consists of alternating time and value data.
+                # Keyframe coordinates are stored as 32-bit floats, so using the same type lets `foreach_set` copy the
+                # buffer directly instead of converting it item-by-item.
+                target_frame_count = resampled_sequence_data_matrix.shape[0]
+
+                # Re-order the data matrix to BxCxF (C being the f-curve index) so that the values for each f-curve are
+                # contiguous in memory, converting it to the keyframe coordinate type in the same pass.
+                fcurve_values_matrix = np.ascontiguousarray(np.transpose(resampled_sequence_data_matrix, (1, 2, 0)),
+                                                            dtype=np.float32)
+                del sequence_data_matrix, resampled_sequence_data_matrix
+                fcurve_data = np.zeros(2 * target_frame_count, dtype=np.float32)
+                fcurve_data[0::2] = np.arange(target_frame_count, dtype=np.float32)
+                fcurve_interpolation_data = np.full(target_frame_count, linear_interpolation, dtype=np.int32)
+
+                for bone_index, import_bone in mapped_bones:
+                    for fcurve_index, fcurve in enumerate(import_bone.fcurves):
+                        if fcurve is None:
+                            continue
+                        # The times never change, so only the values need to be written for each f-curve.
+                        np.copyto(fcurve_data[1::2], fcurve_values_matrix[bone_index, fcurve_index])
+                        keyframe_points = fcurve.keyframe_points
+                        # The keyframes of re-used f-curves are always cleared, since their handles, easing, etc. would
+                        # otherwise carry over.
+                        if len(keyframe_points) > 0:
+                            keyframe_points.clear()
+                        keyframe_points.add(target_frame_count)
+                        keyframe_points.foreach_set('co', fcurve_data)
+                        # Keyframe interpolation is irrelevant once the f-curves are baked to samples.
+                        if not options.should_convert_to_samples:
+                            keyframe_points.foreach_set('interpolation', fcurve_interpolation_data)
 
             if options.should_convert_to_samples:
                 # Bake the curve to samples.
@@ -323,7 +553,10 @@ def import_psa(context: Context, psa_reader: PsaReader, armature_object: Object,
 
         actions.append(action)
 
-        context.window_manager.progress_update(sequence_index)
+        if sequence_index % progress_update_interval == 0:
+            context.window_manager.progress_update(sequence_index)
+
+    context.window_manager.progress_update(len(sequences))
 
     # If the user specifies, store the new animations as strips on a non-contributing NLA track.
     if options.should_stash:
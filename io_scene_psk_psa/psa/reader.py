@@ -49,14 +49,16 @@ class PsaReader(object):
         @return: An FxBx7 matrix where F is the number of frames, B is the number of bones.
         """
         sequence = self.psa.sequences[sequence_name]
-        keys = self.read_sequence_keys(sequence_name)
         bone_count = len(self.bones)
-        matrix_size = sequence.frame_count, bone_count, 7
-        matrix = np.zeros(matrix_size)
-        keys_iter = iter(keys)
-        for frame_index in range(sequence.frame_count):
-            for bone_index in range(bone_count):
-                matrix[frame_index, bone_index, :] = list(next(keys_iter).data)
+        sequence_keys_offset = self.keys_data_offset + (sequence.frame_start_index * bone_count * Psa.KEY_DTYPE.itemsize)
+        self.fp.seek(sequence_keys_offset, 0)
+        buffer = self.fp.read(Psa.KEY_DTYPE.itemsize * bone_count * sequence.frame_count)
+        keys = np.frombuffer(buffer, dtype=Psa.KEY_DTYPE).reshape(sequence.frame_count, bone_count)
+        matrix = np.empty((sequence.frame_count, bone_count, 7))
+        # The keys store the rotation as XYZW, but the matrix stores it as WXYZ.
+        matrix[:, :, 0] = keys['rotation'][:, :, 3]
+        matrix[:, :, 1:4] = keys['rotation'][:, :, :3]
+        matrix[:, :, 4:] = keys['location']
         return matrix
 
     def read_sequence_keys(self, sequence_name: str) -> List[Psa.Key]:
@@ -1,25 +1,65 @@
+import os
 from ctypes import Structure, sizeof
-from typing import Type
+from typing import Type, Collection, List
+
+import numpy as np
 
 from .data import Psa
 from ..shared.data import Section
 
 
-def write_section(fp, name: bytes, data_type: Type[Structure] = None, data: list = None):
+def _get_section_buffers(name: bytes, data_type: Type[Structure] = None, data: Collection = None) -> List[memoryview]:
+    """
+    Returns the buffers for the section header and, if there is any data, a single buffer containing all the records.
+    """
     section = Section()
     section.name = name
     if data_type is not None and data is not None:
         section.data_size = sizeof(data_type)
         section.data_count = len(data)
-    fp.write(section)
-    if data is not None:
-        for datum in data:
-            fp.write(datum)
+    buffers = [memoryview(section).cast('B')]
+    if isinstance(data, np.ndarray):
+        # The array is expected to have the same memory layout as the data type (e.g., Psa.KEY_DTYPE for Psa.Key).
+        if data.dtype.itemsize != sizeof(data_type):
+            raise ValueError(f'The item size of the {name.decode()} data ({data.dtype.itemsize}) does not match the size '
+                             f'of {data_type.__name__} ({sizeof(data_type)})')
+        buffers.append(memoryview(np.ascontiguousarray(data)).cast('B'))
+    elif data is not None:
+        buffers.append(memoryview((data_type * len(data))(*data)).cast('B'))
+    return buffers
+
+
+def _write_buffers(path: str, buffers: List[memoryview]):
+    """
+    Writes the buffers to the file at the given path, in order.
+    Where available, the buffers are submitted together with `os.writev` so that they don't need to be concatenated.
+    """
+    if not hasattr(os, 'writev'):
+        # `os.writev` is not available on Windows.
+        with open(path, 'wb') as fp:
+            for buffer in buffers:
+                fp.write(buffer)
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while len(buffers) > 0:
+            bytes_written = os.writev(fd, buffers)
+            # The write may be partial, so drop whatever has been written and try again with the remainder.
+            while len(buffers) > 0 and bytes_written >= len(buffers[0]):
+                bytes_written -= len(buffers[0])
+                buffers = buffers[1:]
+            if bytes_written > 0:
+                buffers[0] = buffers[0][bytes_written:]
+    finally:
+        os.close(fd)
 
 
 def write_psa(psa: Psa, path: str):
-    with open(path, 'wb') as fp:
-        write_section(fp, b'ANIMHEAD')
-        write_section(fp, b'BONENAMES', Psa.Bone, psa.bones)
-        write_section(fp, b'ANIMINFO', Psa.Sequence, list(psa.sequences.values()))
-        write_section(fp, b'ANIMKEYS', Psa.Key, psa.keys)
+    # Serialize all the sections up-front so that the entire file can be written in as few system calls as possible.
+    buffers = []
+    buffers += _get_section_buffers(b'ANIMHEAD')
+    buffers += _get_section_buffers(b'BONENAMES', Psa.Bone, psa.bones)
+    buffers += _get_section_buffers(b'ANIMINFO', Psa.Sequence, psa.sequences.values())
+    buffers += _get_section_buffers(b'ANIMKEYS', Psa.Key, psa.keys)
+    _write_buffers(path, buffers)
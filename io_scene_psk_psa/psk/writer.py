@@ -19,8 +19,8 @@ def _write_section(fp, name: bytes, data_type: Type[Structure] = None, data: lis
         section.data_count = len(data)
     fp.write(section)
     if data is not None:
-        for datum in data:
-            fp.write(datum)
+        # Write all the records with one call instead of one call per record.
+        fp.write((data_type * len(data))(*data))
 
 
 def write_psk(psk: Psk, path: str):
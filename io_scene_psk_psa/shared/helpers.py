@@ -1,6 +1,6 @@
 import re
 import typing
-from typing import List, Iterable
+from typing import List, Iterable, Optional, Set
 
 import bpy.types
 from bpy.types import NlaStrip, Object, AnimData
@@ -82,7 +82,22 @@ def check_bone_names(bone_names: Iterable[str]):
                            f'You can bypass this by disabling "Enforce Bone Name Restrictions" in the export settings.')
 
 
-def get_export_bone_names(armature_object: Object, bone_filter_mode: str, bone_collection_indices: List[int]) -> List[str]:
+def get_pose_bone_name_from_data_path(data_path: str) -> Optional[str]:
+    """
+    Returns the name of the pose bone targeted by an f-curve data path of the form `pose.bones["<bone_name>"]...`, or
+    None if the data path does not target a pose bone.
+    """
+    prefix = 'pose.bones["'
+    if not data_path.startswith(prefix):
+        return None
+    bone_name_end = data_path.find('"]', len(prefix))
+    if bone_name_end == -1:
+        return None
+    return data_path[len(prefix):bone_name_end]
+
+
+def get_export_bone_names(armature_object: Object, bone_filter_mode: str, bone_collection_indices: List[int],
+                          animated_bone_names: Optional[Set[str]] = None) -> List[str]:
     """
     Returns a sorted list of bone indices that should be exported for the given bone filter mode and bone collections.
 
@@ -91,6 +106,9 @@ def get_export_bone_names(armature_object: Object, bone_filter_mode: str, bone_c
     :param armature_object: Blender object with type 'ARMATURE'
     :param bone_filter_mode: One of ['ALL', 'BONE_COLLECTIONS']
     :param bone_collection_indices: List of bone collection indices to be exported.
+    :param animated_bone_names: If supplied, ancestor bones are pruned from the top of the hierarchy until an ancestor
+    is reached that is either explicitly included or is in this set, or that is the lowest common ancestor of the
+    remaining bones.
     :return: A sorted list of bone indices that should be exported.
     """
     if armature_object is None or armature_object.type != 'ARMATURE':
@@ -127,6 +145,51 @@ def get_export_bone_names(armature_object: Object, bone_filter_mode: str, bone_c
                 bone_index_stack.append((parent_bone_index, bone_index))
         bone_indices[bone_index] = instigator_bone_index
 
+    if animated_bone_names is not None:
+        # Prune the ancestor bones that contribute nothing to the export. An ancestor is kept only if it, or one of its
+        # own ancestors, is explicitly included or animated; this keeps the remaining hierarchy contiguous.
+        bone_name_indices = {bone_name: bone_index for bone_index, bone_name in enumerate(bone_names)}
+
+        def get_parent_bone_index(bone_index: int) -> Optional[int]:
+            parent = bones[bone_index].parent
+            return bone_name_indices[parent.name] if parent is not None else None
+
+        def is_bone_used(bone_index: int) -> bool:
+            return bone_indices[bone_index] is None or bones[bone_index].name in animated_bone_names
+
+        kept_bone_indices = set()
+        for bone_index in bone_indices.keys():
+            ancestor_bone_index = bone_index
+            while ancestor_bone_index is not None and not is_bone_used(ancestor_bone_index):
+                ancestor_bone_index = get_parent_bone_index(ancestor_bone_index)
+            if ancestor_bone_index is not None:
+                kept_bone_indices.add(bone_index)
+
+        # Never prune past the lowest common ancestor of the kept bones, since that would split the hierarchy into
+        # multiple root bones. This way, pruning can only shrink a valid hierarchy, and never invalidate it.
+        kept_root_bone_indices = [x for x in kept_bone_indices if get_parent_bone_index(x) not in kept_bone_indices]
+        if len(kept_root_bone_indices) > 1:
+            ancestor_chains = []
+            for bone_index in kept_root_bone_indices:
+                ancestor_chain = []
+                while bone_index is not None:
+                    ancestor_chain.append(bone_index)
+                    bone_index = get_parent_bone_index(bone_index)
+                ancestor_chains.append(ancestor_chain)
+            common_ancestor_bone_indices = set(ancestor_chains[0]).intersection(*ancestor_chains[1:])
+            # If there is no common ancestor, the hierarchy has multiple roots regardless of pruning.
+            if len(common_ancestor_bone_indices) > 0:
+                for ancestor_chain in ancestor_chains:
+                    for bone_index in ancestor_chain:
+                        kept_bone_indices.add(bone_index)
+                        if bone_index in common_ancestor_bone_indices:
+                            # This is the lowest common ancestor.
+                            break
+
+        for bone_index in list(bone_indices.keys()):
+            if bone_index not in kept_bone_indices:
+                del bone_indices[bone_index]
+
     # Sort the bone index list in-place.
     bone_indices = [(x[0], x[1]) for x in bone_indices.items()]
     bone_indices.sort(key=lambda x: x[0])
@@ -139,8 +202,11 @@ def get_export_bone_names(armature_object: Object, bone_filter_mode: str, bone_c
     bone_names = [bones[x[0]].name for x in bone_indices]
 
     # Ensure that the hierarchy we are sending back has a single root bone.
+    # Note that a bone whose parent is not being exported (i.e., it was pruned) is also a root bone.
     bone_indices = [x[0] for x in bone_indices]
-    root_bones = [bones[bone_index] for bone_index in bone_indices if bones[bone_index].parent is None]
+    exported_bone_names = set(bone_names)
+    root_bones = [bones[bone_index] for bone_index in bone_indices
+                  if bones[bone_index].parent is None or bones[bone_index].parent.name not in exported_bone_names]
     if len(root_bones) > 1:
         # There is more than one root bone.
         # Print out why each root bone was included by linking it to one of the explicitly included bones.